@@ -1,29 +1,59 @@
 import os
 import csv
+import json
+import operator
+import pathlib
+import pickle
 import random
+import re
+import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # --- 1. CONFIGURATION ---
 # Input/Output file names
 INPUT_CSV_FILE = 'content-engine/new_keywords.csv'
 PROCESSED_CSV_FILE = 'content-engine/processed_keywords.csv'
+CSV_FIELDNAMES = ['keyword', 'title']
+PYARROW_MIN_CSV_SIZE = 1 << 20 # Larger input files are parsed with pyarrow when it is installed
 
 # Paths
+# The factory root (parent of content-engine/), where the Git commands run
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 BLOCKS_DIR = 'blocks/'
+# Lives beside the block files it caches (wherever BLOCKS_DIR resolves); .gitignore matches it at any depth
+BLOCKS_CACHE_FILE = os.path.join(BLOCKS_DIR, '.cache.pkl')
+# Bump when the parsing code changes; the settings it reads (placeholders, CTA text) are already in the fingerprint
+BLOCKS_CACHE_VERSION = 4
 # Note: This path is relative to generator.py, going up one level (..) then into the sibling publisher content path
 PUBLISHER_CONTENT_DIR = '../knowledge-hub/content/posts/' 
 
 # Publishing Settings
 NUM_POSTS_TO_GENERATE = 5 # Number of articles to generate and push per run
 AFFILIATE_KEY_CHANCE = 0.6 # Probability of including an affiliate link (60%)
+CTA_PLAIN_TEXT = 'Visit a highly recommended resource here.' # [CTA_LINK] text when there is no affiliate link
+GENERATION_WORKERS = 4 # Threads writing articles in parallel (the work is I/O-bound)
+RNG = random.Random() # Shared generator for single-threaded code; each pooled article gets its own
 
 # Human Publishing Pattern (Random Delay in Seconds)
+# By default the delays only space out the posts' dates; set HUMAN_PACING=1 to actually sleep between posts (local runs)
 MIN_HUMAN_DELAY = 30
 MAX_HUMAN_DELAY = 120
 
 # Quality Requirements (English Structure)
 H2_SECTIONS = ['Benefits-and-Advantages', 'Key-Challenges', 'Practical-Steps-to-Implement', 'Expert-Tips-and-Insights']
+H2_TO_BLOCK = {
+    'Benefits-and-Advantages': 'pros',
+    'Key-Challenges': 'cons',
+    'Practical-Steps-to-Implement': 'steps',
+    'Expert-Tips-and-Insights': 'tips'
+}
+H2_DISPLAY = {h2_tag: h2_tag.replace('-', ' ').title() for h2_tag in H2_SECTIONS}
+# Block keys an article can draw from ('explanation' is loaded but not used yet)
+ARTICLE_BLOCK_KEYS = ['intro', *H2_TO_BLOCK.values(), 'cta', 'cta_plain']
+INTRO_HEADING = "## Introduction: An Overview\n\n"
+CONCLUSION_HEADING = "## Conclusion: Final Thoughts and Next Steps\n\n"
 BLOCK_FILES = {
     'intro': 'intros.txt',
     'explanation': 'explanations.txt',
@@ -33,164 +63,295 @@ BLOCK_FILES = {
     'tips': 'tips.txt',
     'cta': 'cta.txt'
 }
+# Slug cleanup in one pass: spaces become dashes, punctuation is dropped
+SLUG_TABLE = str.maketrans({' ': '-', ':': None, '/': None, '.': None, ',': None})
+# Block placeholders become str.format fields at load time; anything else, braces included, stays literal text
+BLOCK_PLACEHOLDER_RE = re.compile(r'\{(?:keyword|title)\}|\[CTA_LINK\]|[{}]')
+BLOCK_PLACEHOLDER_FIELDS = {'{keyword}': '{keyword}', '{title}': '{title}', '[CTA_LINK]': '{cta_link}'}
+# Placeholders substituted per block type; every other block only gets {keyword}
+BLOCK_PLACEHOLDERS = {
+    'intro': ('{keyword}', '{title}'),
+    'cta': ('{keyword}', '[CTA_LINK]')
+}
 HUMAN_SIGNATURE = "\n---\n\n*Editor's Note: This guide was constructed by the Knowledge Hub engine to provide concise and deep insights into {keyword}. We hope it has been a valuable addition to your knowledge base.*\n"
+HUMAN_SIGNATURE_PARTS = HUMAN_SIGNATURE.split('{keyword}') # Rendered as keyword.join(HUMAN_SIGNATURE_PARTS)
+# JSON-LD fields shared by every post; create_json_ld() adds the per-post values
+JSON_LD_PUBLISHER = {
+    "@type": "Organization",
+    "name": "Knowledge Hub",
+    "logo": {
+        "@type": "ImageObject",
+        "url": "https://knowledgehubs.github.io/knowledge-hub/images/logo.png"
+    }
+}
+JSON_LD_AUTHOR = {
+    "@type": "Person",
+    "name": "Knowledge Hub AI"
+}
 
 # --- 2. CORE FUNCTIONS ---
 
+def blocks_fingerprint():
+    """Returns the mtime fingerprint of the block files, or None if any is missing."""
+    try:
+        # Settings baked into the parsed blocks are part of the key, so editing them invalidates the cache
+        settings = (CTA_PLAIN_TEXT, sorted(BLOCK_PLACEHOLDERS.items()), sorted(BLOCK_PLACEHOLDER_FIELDS.items()))
+        return (BLOCKS_CACHE_VERSION, settings) + tuple(
+            (key, filename, os.stat(os.path.join(BLOCKS_DIR, filename)).st_mtime_ns)
+            for key, filename in BLOCK_FILES.items()
+        )
+    except FileNotFoundError:
+        return None
+
 def load_blocks():
+    """Loads all blocks, reusing the pickled cache while the block files are unchanged."""
+    fingerprint = blocks_fingerprint()
+    if fingerprint is not None:
+        try:
+            with open(BLOCKS_CACHE_FILE, 'rb') as f:
+                cached_fingerprint, cached_blocks = pickle.load(f)
+            if cached_fingerprint == fingerprint:
+                return cached_blocks
+        except FileNotFoundError:
+            pass # First run: the cache is written below
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable blocks cache: {e}")
+
+    blocks = parse_blocks()
+
+    # Only cache a complete set of block files, never the placeholders
+    if fingerprint is not None:
+        try:
+            with open(BLOCKS_CACHE_FILE, 'wb') as f:
+                pickle.dump((fingerprint, blocks), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"⚠️ Could not write blocks cache: {e}")
+    return blocks
+
+def compile_block(line, placeholders=('{keyword}',)):
+    """Turns a block line into a template rendered with a single format_map() call."""
+    def to_template(match):
+        token = match.group()
+        if token in placeholders:
+            return BLOCK_PLACEHOLDER_FIELDS[token]
+        return token.replace('{', '{{').replace('}', '}}')
+    return BLOCK_PLACEHOLDER_RE.sub(to_template, line)
+
+def parse_blocks():
     """Loads all blocks from text files."""
-    blocks = {}
+    lines = {}
     for key, filename in BLOCK_FILES.items():
         try:
-            with open(os.path.join(BLOCKS_DIR, filename), 'r', encoding='utf-8') as f:
-                blocks[key] = [line.strip() for line in f if line.strip()]
+            # One read per file; only non-blank lines pay for a strip
+            data = pathlib.Path(BLOCKS_DIR, filename).read_text(encoding='utf-8')
+            lines[key] = [line.strip() for line in data.splitlines() if line and not line.isspace()]
         except FileNotFoundError:
              print(f"⚠️ Block file not found: {filename}")
              # Placeholder ensures the script doesn't crash if files are empty/missing
-             blocks[key] = ['[Placeholder block content - please fill this file]'] 
+             lines[key] = ['[Placeholder block content - please fill this file]'] 
+
+    blocks = {
+        key: [compile_block(line, BLOCK_PLACEHOLDERS.get(key, ('{keyword}',))) for line in block_lines]
+        for key, block_lines in lines.items()
+    }
+    # CTAs for articles without an affiliate key, with the plain link text already filled in
+    blocks['cta_plain'] = [compile_block(line.replace('[CTA_LINK]', CTA_PLAIN_TEXT)) for line in lines['cta']]
     return blocks
 
-def load_keywords():
-    """Loads keywords from the main CSV file."""
-    keywords_list = []
-    if not os.path.exists(INPUT_CSV_FILE) or os.path.getsize(INPUT_CSV_FILE) == 0:
-        return []
+def load_keywords_pyarrow():
+    """Parses the main CSV file with pyarrow's C reader; returns the same shape as load_keywords()."""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
 
     with open(INPUT_CSV_FILE, mode='r', newline='', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
+        header = next(csv.reader(file), [])
+    if 'keyword' not in header or 'title' not in header:
+        return [], header, []
+
+    # Every column is read as text so values are written back exactly as they were
+    table = pa_csv.read_csv(
+        INPUT_CSV_FILE,
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(column_types={name: pa.string() for name in header})
+    )
+
+    # Only the sampled rows become dicts; the rest stay plain tuples for the write-back
+    indices = RNG.sample(range(table.num_rows), min(table.num_rows, NUM_POSTS_TO_GENERATE))
+    batch = list(zip(indices, table.select(CSV_FIELDNAMES).take(indices).to_pylist()))
+    rows = list(zip(*(column.to_pylist() for column in table.columns)))
+    return batch, header, rows
+
+def load_keywords():
+    """Reservoir-samples a batch from the main CSV file; returns (batch, header, all rows)."""
+    # A single stat() answers both "does it exist" and "how big is it"
+    try:
+        input_size = os.stat(INPUT_CSV_FILE).st_size
+    except FileNotFoundError:
+        return [], CSV_FIELDNAMES, []
+    if input_size == 0:
+        return [], CSV_FIELDNAMES, []
+
+    if input_size > PYARROW_MIN_CSV_SIZE:
+        try:
+            return load_keywords_pyarrow()
+        except ImportError:
+            pass # pyarrow is optional; the csv module below handles any size
+        except Exception as e:
+            print(f"⚠️ pyarrow could not parse {INPUT_CSV_FILE}: {e}. Falling back to csv.")
+
+    with open(INPUT_CSV_FILE, mode='r', newline='', encoding='utf-8', buffering=1 << 20) as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        if 'keyword' not in header or 'title' not in header:
+            return [], header, []
+
+        rows = []
+        reservoir = [] # Indices of the sampled rows (Algorithm R)
+        width = len(header)
         for row in reader:
-            if 'keyword' in row and 'title' in row:
-                keywords_list.append(row)
-    return keywords_list
+            if not row:
+                continue # Blank line; DictReader skipped these too
+            if len(row) < width:
+                row += [''] * (width - len(row)) # Pad short rows so every column is present
+            i = len(rows)
+            rows.append(row)
+            if i < NUM_POSTS_TO_GENERATE:
+                reservoir.append(i)
+            else:
+                j = RNG.randint(0, i)
+                if j < NUM_POSTS_TO_GENERATE:
+                    reservoir[j] = i
 
-def update_keywords_csv(remaining_keywords, processed_keywords):
+    # Rows keep every column of the file's own header; only the sampled ones are mapped to keyword/title.
+    # Each batch entry keeps its row index so the caller can exclude it positionally
+    pick = operator.itemgetter(*(header.index(name) for name in CSV_FIELDNAMES))
+    batch = [(i, dict(zip(CSV_FIELDNAMES, pick(rows[i])))) for i in reservoir]
+    return batch, header, rows
+
+def update_keywords_csv(remaining_keywords, processed_keywords, header=CSV_FIELDNAMES):
     """Updates the CSV files, moving processed keywords to a dedicated file."""
-    
-    # Write the remaining (unprocessed) keywords back to the input file
+    # Nothing moved: the input file is already up to date, so skip its full rewrite
+    if not processed_keywords:
+        return
+
+    # Write the remaining (unprocessed) rows back to the input file
     if remaining_keywords:
-        fieldnames = ['keyword', 'title']
         with open(INPUT_CSV_FILE, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(file, lineterminator='\n')
+            writer.writerow(header) # The input file's own columns, so extra ones survive the rewrite
             writer.writerows(remaining_keywords)
-    elif os.path.exists(INPUT_CSV_FILE):
-        os.remove(INPUT_CSV_FILE)
-
-    # Load previously processed data
-    previous_processed = []
-    if os.path.exists(PROCESSED_CSV_FILE) and os.path.getsize(PROCESSED_CSV_FILE) > 0:
+    else:
         try:
-            with open(PROCESSED_CSV_FILE, mode='r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                previous_processed = list(reader)
-        except Exception as e:
-            print(f"Error reading previous processed CSV: {e}. Overwriting.")
+            os.remove(INPUT_CSV_FILE)
+        except FileNotFoundError:
+            pass
+
+    # Append the new processed rows; the header is only written when starting a new file
+    try:
+        has_rows = os.stat(PROCESSED_CSV_FILE).st_size > 0
+    except FileNotFoundError:
+        has_rows = False
+    # A hand-edited log may lack its final newline; the first appended row must not join its last line
+    missing_newline = False
+    if has_rows:
+        with open(PROCESSED_CSV_FILE, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            missing_newline = file.read(1) not in (b'\n', b'\r')
+    with open(PROCESSED_CSV_FILE, mode='a' if has_rows else 'w', newline='', encoding='utf-8', buffering=1 << 20) as file:
+        # LF endings, like the input file above, so appends never mix in csv's default \r\n
+        writer = csv.writer(file, lineterminator='\n')
+        if missing_newline:
+            file.write('\n')
+        if not has_rows:
+            writer.writerow(CSV_FIELDNAMES)
+        writer.writerows((row['keyword'], row['title']) for row in processed_keywords)
 
-    # Combine old and new processed data
-    all_processed = previous_processed + processed_keywords
-    
-    # Write the combined list to the processed file
-    if all_processed:
-        fieldnames = ['keyword', 'title']
-        with open(PROCESSED_CSV_FILE, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(all_processed)
 
+def choose_blocks(loaded_blocks, count, rng=RNG):
+    """Pre-draws one block per key for each of `count` articles, with one choices() call per key."""
+    # Empty block files are left out, so only the articles that need them fail (see pick_block)
+    drawn = {key: rng.choices(loaded_blocks[key], k=count) for key in ARTICLE_BLOCK_KEYS if loaded_blocks[key]}
+    return [{key: drawn[key][n] for key in drawn} for n in range(count)]
 
-def generate_post_content(keyword_data, loaded_blocks):
+def pick_block(picks, loaded_blocks, key, rng=RNG):
+    """Returns the pre-drawn block for `key`; an empty block file raises IndexError here, as random.choice did."""
+    if key in picks:
+        return picks[key]
+    return rng.choice(loaded_blocks[key])
+
+def generate_post_content(keyword_data, loaded_blocks, rng=RNG, picks=None):
     """Assembles content, applies structure, and quality controls."""
     keyword = keyword_data['keyword']
     title = keyword_data['title']
+    # Every block key is used at most once per article, so one pre-drawn block per key is enough
+    if picks is None:
+        picks = choose_blocks(loaded_blocks, 1, rng)[0]
     
-    affiliate_key = f'OFFER_{random.randint(100, 999)}' if random.random() < AFFILIATE_KEY_CHANCE else None
+    affiliate_key = f'OFFER_{rng.randint(100, 999)}' if rng.random() < AFFILIATE_KEY_CHANCE else None
+    # Values for the placeholders compiled into the block templates
+    fields = {'keyword': keyword, 'title': title}
 
     # --- Content Assembly ---
     sections = []
     
     # 1. Intro
-    intro_title = "Introduction: An Overview"
-    intro = f"## {intro_title}\n\n" + random.choice(loaded_blocks['intro'])
-    sections.append(intro.replace('{keyword}', keyword).replace('{title}', title))
+    sections.append(INTRO_HEADING + pick_block(picks, loaded_blocks, 'intro', rng).format_map(fields))
 
     # 2. Body Sections (Randomized but structured)
-    selected_h2 = random.sample(H2_SECTIONS, random.randint(3, 4))
+    selected_h2 = rng.sample(H2_SECTIONS, rng.randint(3, 4))
     
     for h2_tag in selected_h2:
-        section_content = ""
-        block_key = ""
-        
-        if 'Benefits' in h2_tag:
-            block_key = 'pros'
-            section_content = random.choice(loaded_blocks['pros'])
-        elif 'Challenges' in h2_tag:
-            block_key = 'cons'
-            section_content = random.choice(loaded_blocks['cons'])
-        elif 'Steps' in h2_tag:
-            block_key = 'steps'
-            section_content = random.choice(loaded_blocks['steps'])
-        elif 'Tips' in h2_tag:
-            block_key = 'tips'
-            section_content = random.choice(loaded_blocks['tips'])
+        block_key = H2_TO_BLOCK[h2_tag]
+        section_content = pick_block(picks, loaded_blocks, block_key, rng)
+        display_h2 = H2_DISPLAY[h2_tag]
         
-        display_h2 = h2_tag.replace('-', ' ').title()
-        
-        sections.append(f"## {display_h2}\n\n" + section_content.replace('{keyword}', keyword))
+        sections.append(f"## {display_h2}\n\n" + section_content.format_map(fields))
 
     # 3. Conclusion (CTA)
-    cta_text = random.choice(loaded_blocks['cta'])
-    conclusion_title = "Conclusion: Final Thoughts and Next Steps"
-    
     if affiliate_key:
         # This is the Hugo shortcode syntax that we will implement in the Publisher
-        cta_text = cta_text.replace('[CTA_LINK]', f'{{{{< affiliate_link key="{affiliate_key}" text="Click Here to Start" >}}}}')
+        fields['cta_link'] = f'{{{{< affiliate_link key="{affiliate_key}" text="Click Here to Start" >}}}}'
+        cta_text = pick_block(picks, loaded_blocks, 'cta', rng)
     else:
-        cta_text = cta_text.replace('[CTA_LINK]', 'Visit a highly recommended resource here.') 
+        cta_text = pick_block(picks, loaded_blocks, 'cta_plain', rng)
 
-    sections.append(f"## {conclusion_title}\n\n" + cta_text.replace('{keyword}', keyword))
+    sections.append(CONCLUSION_HEADING + cta_text.format_map(fields))
     
     # 4. Human Signature
-    sections.append(HUMAN_SIGNATURE.replace('{keyword}', keyword))
+    sections.append(keyword.join(HUMAN_SIGNATURE_PARTS))
 
     full_content = "\n\n".join(sections)
     return full_content, affiliate_key
 
 def create_json_ld(title, date, url):
     """Creates JSON-LD Structured Data (Article) for SEO."""
-    return f"""
-<script type="application/ld+json">
-{{
-  "@context": "https://schema.org",
-  "@type": "Article",
-  "headline": "{title.replace('"', '\\"')}",
-  "datePublished": "{date.isoformat()}",
-  "mainEntityOfPage": "{url}",
-  "publisher": {{
-    "@type": "Organization",
-    "name": "Knowledge Hub",
-    "logo": {{
-      "@type": "ImageObject",
-      "url": "https://knowledgehubs.github.io/knowledge-hub/images/logo.png"
-    }}
-  }},
-  "author": {{
-    "@type": "Person",
-    "name": "Knowledge Hub AI"
-  }}
-}}
-</script>
-"""
+    doc = {
+        "@context": "https://schema.org",
+        "@type": "Article",
+        "headline": title,
+        "datePublished": date.isoformat(),
+        "mainEntityOfPage": url,
+        "publisher": JSON_LD_PUBLISHER,
+        "author": JSON_LD_AUTHOR
+    }
+    # Escape "</" so a title can never close the surrounding script tag
+    json_text = json.dumps(doc, ensure_ascii=False, indent=2).replace('</', '<\\/')
+    return f'\n<script type="application/ld+json">\n{json_text}\n</script>\n'
+
+def make_slug(title):
+    """Simple English slug generation."""
+    return title.lower().translate(SLUG_TABLE)[:60]
 
-def generate_markdown_file(keyword_data, content, affiliate_key):
+def generate_markdown_file(keyword_data, content, affiliate_key, post_date=None, rng=RNG):
     """Assembles Front-Matter, JSON-LD, and content into a Markdown file."""
     title = keyword_data['title']
     keyword = keyword_data['keyword']
     
-    # Simple English slug generation
-    slug = title.lower().replace(' ', '-').replace(':', '').replace('/', '').replace('.', '').replace(',', '')[:60]
+    slug = make_slug(title)
     
-    # Random date within the last 10 minutes (for human-like timing)
-    post_date = datetime.now() - timedelta(minutes=random.randint(1, 10))
+    # Random date within the last 10 minutes (for human-like timing), unless the caller staggers the dates
+    if post_date is None:
+        post_date = datetime.now() - timedelta(minutes=rng.randint(1, 10))
     
     # Front Matter
     front_matter = f"""---
@@ -212,30 +373,35 @@ canonical: "/posts/{slug}/"
     filename = f"{slug}.md"
     # Note: We create the file in the relative path that points to the Publisher's content folder
     filepath = os.path.join(PUBLISHER_CONTENT_DIR, filename)
-    
-    # Ensure the path exists before writing (important for CI environment)
-    os.makedirs(os.path.dirname(filepath), exist_ok=True) 
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(final_content)
+    # Encode once and hand the whole post to a single buffered write
+    with open(filepath, 'wb', buffering=1 << 20) as f:
+        f.write(final_content.encode('utf-8'))
         
     return filepath
 
+def produce(keyword_data, loaded_blocks, post_date=None, pace=False, rng=RNG, picks=None):
+    """Generates one article and writes it, optionally sleeping afterwards to simulate a human pattern."""
+    content, affiliate_key = generate_post_content(keyword_data, loaded_blocks, rng, picks)
+    filepath = generate_markdown_file(keyword_data, content, affiliate_key, post_date, rng)
+
+    if pace:
+        delay = rng.randint(MIN_HUMAN_DELAY, MAX_HUMAN_DELAY)
+        print(f"⏳ Delaying for {delay} seconds to simulate human pattern...")
+        time.sleep(delay)
+    return filepath
+
 def execute_git_push(commit_message):
     """Executes the Git Commit operation (The Action handles the Push)."""
-    os.chdir(os.path.abspath(os.path.dirname(__file__)))
-    os.chdir('..') # Move to the factory root
-
     print("--- 🔄 Starting Git operations... ---")
     
     # 1. Add Files
-    # Add files inside content-engine/ (CSV files) and new posts inside the relative publisher path
-    os.system('git add content-engine/') 
-    os.system(f'git add {PUBLISHER_CONTENT_DIR.replace("../", "")}') 
+    # Add files inside content-engine/ (CSV files) and new posts inside the relative publisher path in one index pass
+    # Arguments go straight to git (no shell), so the commit message needs no quoting
+    subprocess.run(['git', 'add', '--', 'content-engine/', PUBLISHER_CONTENT_DIR.replace('../', '')], cwd=REPO_ROOT, check=True)
 
     # 2. Commit
-    commit_command = f'git commit -m "{commit_message}"'
-    os.system(commit_command)
+    subprocess.run(['git', 'commit', '-m', commit_message], cwd=REPO_ROOT, check=True)
 
     print("--- ✅ Commit successful. The Workflow will handle the secure Push. ---")
     
@@ -243,46 +409,79 @@ def execute_git_push(commit_message):
 
 if __name__ == "__main__":
     SYSTEM_MODE = os.environ.get('SYSTEM_MODE', 'TEST')
+    HUMAN_PACING = os.environ.get('HUMAN_PACING') == '1'
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    # Ensure the publisher path exists before writing (important for CI environment)
+    os.makedirs(PUBLISHER_CONTENT_DIR, exist_ok=True)
     loaded_blocks = load_blocks()
-    all_keywords = load_keywords()
+    keywords_to_process_batch, input_header, all_keywords = load_keywords()
     
-    if not all_keywords:
+    if not keywords_to_process_batch:
         print("🛑 No new keywords to process in the input CSV. Script exiting.")
         exit(0)
-
-    keywords_to_process_batch = random.sample(all_keywords, min(len(all_keywords), NUM_POSTS_TO_GENERATE))
     
     print(f"🎉 Starting generation and push of {len(keywords_to_process_batch)} articles in {SYSTEM_MODE} mode.")
     
     processed_count = 0
     processed_batch_data = [] 
-    
-    for data in keywords_to_process_batch:
-        if SYSTEM_MODE == 'TEST':
+    processed_idxs = set()
+
+    if SYSTEM_MODE == 'TEST':
+        for _, data in keywords_to_process_batch:
             print(f"📝 TEST mode: Article '{data['title']}' generated. Skipping permanent update and push.")
-            processed_batch_data.append(data) # Still mark as processed in test to see the next batch next time
-            continue
+        # The batch is sampled at random on every run, so TEST runs need not churn the CSV files
+    else:
+        # Titles sharing their first 60 characters map to the same file; concurrent writes to it would interleave,
+        # so only the first one is written and the rest stay in the input CSV for a later run
+        articles = []
+        batch_slugs = set()
+        for index, data in keywords_to_process_batch:
+            # Padded short rows have an empty keyword or title; like a failed article, they stay in the CSV
+            if not data['keyword'] or not data['title']:
+                print(f"⚠️ Skipping data row {index + 1} (blank lines not counted): it needs both a keyword and a title.")
+                continue
+            slug = make_slug(data['title'])
+            if slug in batch_slugs:
+                print(f"⚠️ Skipping article '{data['title']}': slug '{slug}' is already used in this batch.")
+                continue
+            batch_slugs.add(slug)
+            articles.append((index, data))
 
-        try:
-            content, affiliate_key = generate_post_content(data, loaded_blocks)
-            filepath = generate_markdown_file(data, content, affiliate_key)
-            
-            processed_batch_data.append(data) 
-            processed_count += 1
-            
-            print(f"✅ Successfully generated {filepath}. Simulating human delay...")
-            
-            delay = random.randint(MIN_HUMAN_DELAY, MAX_HUMAN_DELAY)
-            print(f"⏳ Delaying for {delay} seconds to simulate human pattern...")
-            time.sleep(delay)
-            
-        except Exception as e:
-            print(f"❌ Failed to generate article '{data['title']}': {e}")
+        # Without pacing, posts are dated one human delay apart going back from a recent start
+        post_dates = []
+        post_date = datetime.now() - timedelta(minutes=RNG.randint(1, 10))
+        for _ in articles:
+            post_dates.append(None if HUMAN_PACING else post_date)
+            post_date -= timedelta(seconds=RNG.randint(MIN_HUMAN_DELAY, MAX_HUMAN_DELAY))
+
+        # Blocks for the whole batch are drawn up front, one choices() call per block key
+        batch_picks = choose_blocks(loaded_blocks, len(articles))
+
+        # Articles are independent file writes, so they run in a thread pool; pacing runs them one at a time
+        with ThreadPoolExecutor(max_workers=1 if HUMAN_PACING else GENERATION_WORKERS) as executor:
+            # A separately seeded generator per article keeps threads off a shared RNG state
+            futures = [
+                executor.submit(
+                    produce, data, loaded_blocks, post_dates[n], HUMAN_PACING, random.Random(os.urandom(8)), batch_picks[n]
+                )
+                for n, (index, data) in enumerate(articles)
+            ]
+            # Results are collected in submission order so the processed CSV order does not depend on thread timing
+            for (index, data), future in zip(articles, futures):
+                try:
+                    filepath = future.result()
+                except Exception as e:
+                    print(f"❌ Failed to generate article '{data['title']}': {e}")
+                    continue
+
+                processed_batch_data.append(data)
+                processed_idxs.add(index)
+                processed_count += 1
+                print(f"✅ Successfully generated {filepath}.")
             
-    # Final keyword management: remove processed keywords from the input list
-    remaining_keywords = [k for k in all_keywords if k not in processed_batch_data]
-    update_keywords_csv(remaining_keywords, processed_batch_data)
+    # Final keyword management: remove processed keywords from the input list by index
+    remaining_keywords = [row for i, row in enumerate(all_keywords) if i not in processed_idxs]
+    update_keywords_csv(remaining_keywords, processed_batch_data, input_header)
 
     if processed_count > 0 and SYSTEM_MODE == 'LIVE':
         commit_msg = f"AUTO: Publish {processed_count} new articles on {datetime.now().strftime('%Y-%m-%d %H:%M')}"